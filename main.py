@@ -5,14 +5,125 @@ A GitHub Actions plugin for Edge Platform package management and deployment.
 """
 
 import os
+import asyncio
+import re
 import sys
 import json
+import mmap
+import shutil
+import subprocess
 import tarfile
 import tempfile
 import time
+import random
 import requests
-from pathlib import Path
-from typing import Dict, List, Optional, Any
+from requests.adapters import HTTPAdapter
+from requests_toolbelt.multipart.encoder import FileWrapper, MultipartEncoder
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    Pattern,
+    Tuple,
+)
+
+# Optional: deployments fan out over a multiplexed HTTP/2 connection when
+# httpx and h2 are installed, otherwise over the pooled requests session
+try:
+    import h2  # noqa: F401
+    import httpx
+except ImportError:
+    httpx = None
+
+# Optional: SIMD-accelerated gzip compression for fast_compression
+try:
+    from isal import igzip, isal_zlib
+except ImportError:
+    igzip = None
+
+# Upper bound on parallel API requests, shared by the HTTP connection pool
+MAX_CONCURRENT_REQUESTS = 16
+
+# Longest Retry-After delay (seconds) waited out; longer requests are not retried
+MAX_RETRY_AFTER = 30
+
+# File extensions whose contents are already compressed and barely shrink
+# further under gzip
+PRECOMPRESSED_EXTENSIONS = frozenset(
+    {
+        ".7z",
+        ".br",
+        ".bz2",
+        ".gz",
+        ".jar",
+        ".jpeg",
+        ".jpg",
+        ".mp3",
+        ".mp4",
+        ".png",
+        ".tgz",
+        ".webm",
+        ".webp",
+        ".whl",
+        ".xz",
+        ".zip",
+        ".zst",
+    }
+)
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """Translate a glob to a regex where only "**/" can cross directories"""
+    # Unlike fnmatch.translate, "*" and "?" stay within one path segment, so
+    # "src/*.js" matches like Path.glob/Path.match do (glob.translate in 3.13)
+    i, n = 0, len(pattern)
+    parts = []
+    while i < n:
+        if pattern.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("**", i) and i + 2 == n:
+            parts.append(".*")
+            i += 2
+            continue
+
+        c = pattern[i]
+        i += 1
+        if c == "*":
+            parts.append("[^/]*")
+        elif c == "?":
+            parts.append("[^/]")
+        elif c == "[":
+            j = i
+            if j < n and pattern[j] == "!":
+                j += 1
+            if j < n and pattern[j] == "]":
+                j += 1
+            while j < n and pattern[j] != "]":
+                j += 1
+            if j >= n:
+                parts.append("\\[")
+            else:
+                chars = pattern[i:j].replace("\\", "\\\\")
+                i = j + 1
+                if chars.startswith("!"):
+                    chars = "^/" + chars[1:]
+                elif chars.startswith("^"):
+                    chars = "\\" + chars
+                parts.append(f"[{chars}]")
+        else:
+            parts.append(re.escape(c))
+
+    return "(?s:" + "".join(parts) + ")\\Z"
 
 
 class EdgePlatformAction:
@@ -40,9 +151,27 @@ class EdgePlatformAction:
         self.include_patterns = os.getenv("INPUT_INCLUDE_PATTERNS")
         self.exclude_patterns = os.getenv("INPUT_EXCLUDE_PATTERNS")
 
+        # Compression inputs
+        self.compress_level = os.getenv("INPUT_COMPRESS_LEVEL", "")
+        self.fast_compression: bool = (
+            os.getenv("INPUT_FAST_COMPRESSION", "false").lower() == "true"
+        )
+
+        # Outputs buffered by set_output()
+        self._outputs: List[str] = []
+
         # Validation
         self._validate_inputs()
 
+        # Shared HTTP session so requests reuse pooled keep-alive connections
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=10, pool_maxsize=MAX_CONCURRENT_REQUESTS, max_retries=0
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["Authorization"] = f"Bearer {self.api_token}"
+
     def _validate_inputs(self):
         """Validate required inputs based on workflow"""
         if not self.api_token:
@@ -51,17 +180,19 @@ class EdgePlatformAction:
         if not self.workflow:
             self.error("Workflow is required")
 
-        workflow_steps = self.parse_workflow(self.workflow)
+        # The workflow is fixed for the lifetime of the action, so parse it once
+        self._steps = self.parse_workflow(self.workflow)
+        self._step_set = frozenset(self._steps)
 
         # Validate package-related inputs for upload/push
-        if any(step in workflow_steps for step in ["upload", "push"]):
+        if self._step_set & {"upload", "push"}:
             if not all([self.package_path, self.package_name, self.package_tag]):
                 self.error(
                     "package_path, package_name, and package_tag are required for upload/push workflows"
                 )
 
         # Validate deployment inputs
-        if "deploy" in workflow_steps:
+        if "deploy" in self._step_set:
             if not self.node_ids and not self.all_nodes:
                 self.error("node_ids or all_nodes is required for deploy workflow")
             if not self.package_name or not self.package_tag:
@@ -73,6 +204,28 @@ class EdgePlatformAction:
         if self.include_patterns and self.exclude_patterns:
             self.error("include_patterns and exclude_patterns are mutually exclusive")
 
+        # Compile file patterns once for the package walk. Exclude patterns
+        # without a path separator match any path component (e.g. a directory
+        # name), the rest match the trailing part of the relative path.
+        # Plain file names are kept in sets so most checks are a hash lookup.
+        include = self._split_patterns(self.include_patterns)
+        exclude = self._split_patterns(self.exclude_patterns)
+        self._include_names, include_globs = self._split_literals(include)
+        self._include_re = self._compile_patterns(include_globs, any_depth=True)
+        self._exclude_names, exclude_globs = self._split_literals(
+            [p for p in exclude if "/" not in p]
+        )
+        self._exclude_name_re = self._compile_patterns(exclude_globs)
+        self._exclude_path_re = self._compile_patterns(
+            [p for p in exclude if "/" in p], any_depth=True
+        )
+
+        # Validate compression level (empty selects it automatically)
+        if self.compress_level and (
+            not self.compress_level.isdigit() or not 1 <= int(self.compress_level) <= 9
+        ):
+            self.error("compress_level must be an integer between 1 and 9")
+
     def parse_workflow(self, workflow_string: str) -> List[str]:
         """Parse comma-separated workflow string into list of steps"""
         steps = [step.strip() for step in workflow_string.split(",")]
@@ -88,20 +241,20 @@ class EdgePlatformAction:
 
     def execute_workflows(self) -> Dict[str, Any]:
         """Execute workflow steps in specified order"""
-        steps = self.parse_workflow(self.workflow)
+        steps = self._steps
         results = {}
 
         self.log(f"Executing workflow steps: {', '.join(steps)}")
 
+        dispatch: Dict[str, Callable[[], Dict[str, Any]]] = {
+            "push": self.execute_registry_push,
+            "upload": self.execute_package_upload,
+            "deploy": lambda: self.execute_deployment(results.get("upload")),
+        }
+
         for step in steps:
             self.log(f"Executing step: {step}")
-
-            if step == "push":
-                results["push"] = self.execute_registry_push()
-            elif step == "upload":
-                results["upload"] = self.execute_package_upload()
-            elif step == "deploy":
-                results["deploy"] = self.execute_deployment(results.get("upload"))
+            results[step] = dispatch[step]()
 
         return results
 
@@ -117,13 +270,20 @@ class EdgePlatformAction:
             if not os.path.exists(self.package_path):
                 raise Exception(f"Package path does not exist: {self.package_path}")
 
-            # Step 2: Create package archive
-            package_file = self.create_package_archive()
+            # Step 2: Collect package files
+            package_files, total_bytes, precompressed_bytes = (
+                self.collect_package_files()
+            )
 
             # Step 3: Validate package structure
-            self.validate_package_structure(package_file)
+            self.validate_package_structure(package_files)
+
+            # Step 4: Create package archive
+            package_file = self.create_package_archive(
+                package_files, total_bytes, precompressed_bytes
+            )
 
-            # Step 4: Upload package
+            # Step 5: Upload package
             upload_result = self.upload_package_to_api(package_file)
 
             # Cleanup temporary file
@@ -135,110 +295,295 @@ class EdgePlatformAction:
             self.error(f"Package upload failed: {str(e)}")
             return {"status": "failed", "error": str(e)}
 
-    def create_package_archive(self) -> str:
+    def create_package_archive(
+        self,
+        package_files: List[str],
+        total_bytes: int = 0,
+        precompressed_bytes: int = 0,
+    ) -> str:
         """Create tar.gz archive of the package"""
-        package_filename = f"{self.package_name}-{self.package_tag}.tar.gz"
+        level = self._select_compress_level(total_bytes, precompressed_bytes)
+
+        use_isal = self.fast_compression and igzip is not None
+        if self.fast_compression and not use_isal:
+            self.log("isal is not installed, fast_compression has no effect")
 
         with tempfile.NamedTemporaryFile(suffix=".tar.gz", delete=False) as tmp_file:
-            with tarfile.open(tmp_file.name, "w:gz") as tar:
-                package_path = Path(self.package_path)
-
-                if self.include_patterns:
-                    # Include specific patterns
-                    patterns = [p.strip() for p in self.include_patterns.split(",")]
-                    for pattern in patterns:
-                        for file_path in package_path.rglob(pattern):
-                            if file_path.is_file():
-                                arcname = file_path.relative_to(package_path)
-                                tar.add(file_path, arcname=arcname)
-
-                elif self.exclude_patterns:
-                    # Exclude specific patterns
-                    patterns = [p.strip() for p in self.exclude_patterns.split(",")]
-                    for file_path in package_path.rglob("*"):
-                        if file_path.is_file():
-                            arcname = file_path.relative_to(package_path)
-                            # Check if file matches any exclude pattern
-                            should_exclude = False
-                            for pattern in patterns:
-                                if file_path.match(pattern) or any(
-                                    part.match(pattern) for part in file_path.parts
-                                ):
-                                    should_exclude = True
-                                    break
-                            if not should_exclude:
-                                tar.add(file_path, arcname=arcname)
-                else:
-                    # Include all files
-                    for file_path in package_path.rglob("*"):
-                        if file_path.is_file():
-                            arcname = file_path.relative_to(package_path)
-                            tar.add(file_path, arcname=arcname)
+            if shutil.which("tar") and (use_isal or shutil.which("pigz")):
+                self._archive_with_tar(package_files, tmp_file, level, use_isal)
+            else:
+                self.log("tar/pigz not found on PATH, falling back to tarfile")
+                self._archive_with_tarfile(package_files, tmp_file, level, use_isal)
 
             return tmp_file.name
 
-    def validate_package_structure(self, package_file: str):
+    def _select_compress_level(self, total_bytes: int, precompressed_bytes: int) -> int:
+        """Pick the gzip level, dropping to 1 for mostly precompressed packages"""
+        if self.compress_level:
+            return int(self.compress_level)
+
+        # DEFLATE cost scales with input size, not with the achievable ratio,
+        # so spending level 6 on JPEGs or nested archives buys almost nothing
+        if total_bytes and precompressed_bytes * 2 > total_bytes:
+            self.log(
+                f"{precompressed_bytes}/{total_bytes} bytes are already compressed, "
+                "using compression level 1"
+            )
+            return 1
+
+        return 6
+
+    def collect_package_files(self) -> Tuple[List[str], int, int]:
+        """Collect archive names of the files to package, with their byte counts"""
+        root = self.package_path
+        # Walked paths are built with os.path.join, so they all start with this
+        # prefix; slicing it off is far cheaper than os.path.relpath per file
+        prefix_len = len(os.path.join(root, ""))
+        package_files = []
+
+        # Total and precompressed bytes for _select_compress_level, only
+        # counted when the level is chosen automatically (0 otherwise)
+        count_bytes = not self.compress_level
+        total_bytes = 0
+        precompressed_bytes = 0
+
+        def add(entry: os.DirEntry, arcname: str):
+            nonlocal total_bytes, precompressed_bytes
+            package_files.append(arcname)
+            if count_bytes:
+                size = entry.stat().st_size
+                total_bytes += size
+                if os.path.splitext(entry.name)[1].lower() in PRECOMPRESSED_EXTENSIONS:
+                    precompressed_bytes += size
+
+        if self._include_names or self._include_re:
+            # Include specific patterns
+            include_names = self._include_names
+            include_re = self._include_re
+            for entry in self._walk_files(root):
+                arcname = entry.path[prefix_len:]
+                if entry.name in include_names or (
+                    include_re and include_re.match(arcname)
+                ):
+                    add(entry, arcname)
+
+        elif self._exclude_names or self._exclude_name_re or self._exclude_path_re:
+            # Exclude specific patterns, pruning excluded directories from the walk
+            exclude_names = self._exclude_names
+            name_re = self._exclude_name_re
+            path_re = self._exclude_path_re
+
+            def is_excluded_name(name: str) -> bool:
+                return name in exclude_names or bool(name_re and name_re.match(name))
+
+            for entry in self._walk_files(root, exclude_dir=is_excluded_name):
+                arcname = entry.path[prefix_len:]
+                if is_excluded_name(entry.name):
+                    continue
+                if path_re and path_re.match(arcname):
+                    continue
+                add(entry, arcname)
+        else:
+            # Include all files
+            for entry in self._walk_files(root):
+                add(entry, entry.path[prefix_len:])
+
+        return package_files, total_bytes, precompressed_bytes
+
+    @staticmethod
+    def _split_patterns(patterns: Optional[str]) -> List[str]:
+        """Split comma-separated glob patterns, dropping empty entries"""
+        if not patterns:
+            return []
+        # Only files are matched, so "dist/" means the directory "dist"
+        stripped = (p.strip().rstrip("/") for p in patterns.split(","))
+        return [p for p in stripped if p]
+
+    @staticmethod
+    def _split_literals(patterns: List[str]) -> Tuple[FrozenSet[str], List[str]]:
+        """Split patterns into plain file names and glob patterns"""
+        literals = frozenset(
+            p for p in patterns if "/" not in p and not any(c in p for c in "*?[")
+        )
+        return literals, [p for p in patterns if p not in literals]
+
+    @staticmethod
+    def _compile_patterns(
+        patterns: List[str], any_depth: bool = False
+    ) -> Optional[Pattern[str]]:
+        """Compile glob patterns into a single regex, or None if there are none"""
+        if not patterns:
+            return None
+        prefix = "(?s:.*/)?" if any_depth else ""
+        return re.compile(
+            "|".join(f"(?:{prefix}{_glob_to_regex(p)})" for p in patterns)
+        )
+
+    def _walk_files(
+        self, root: str, exclude_dir: Optional[Callable[[str], bool]] = None
+    ) -> Iterator[os.DirEntry]:
+        """Yield entries of regular files under root, skipping excluded directories"""
+        with os.scandir(root) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if exclude_dir is None or not exclude_dir(entry.name):
+                        yield from self._walk_files(entry.path, exclude_dir)
+                elif entry.is_file():
+                    yield entry
+
+    def _archive_with_tar(
+        self,
+        package_files: List[str],
+        archive: IO[bytes],
+        level: int,
+        use_isal: bool = False,
+    ):
+        """Write archive with tar, compressed by pigz or in-process by ISA-L"""
+        # Both archive backends take exactly the walked file list and never
+        # enumerate directories themselves, so each file is visited once
+        with tempfile.NamedTemporaryFile() as file_list:
+            file_list.write(
+                b"".join(os.fsencode(name) + b"\0" for name in package_files)
+            )
+            file_list.flush()
+
+            tar_proc = subprocess.Popen(
+                [
+                    "tar",
+                    "--null",
+                    "--verbatim-files-from",
+                    "--no-recursion",
+                    "-C",
+                    self.package_path,
+                    "-cf",
+                    "-",
+                    "-T",
+                    file_list.name,
+                ],
+                stdout=subprocess.PIPE,
+            )
+
+            if use_isal:
+                with self._isal_writer(archive, level) as gz:
+                    shutil.copyfileobj(tar_proc.stdout, gz, 1024 * 1024)
+                tar_proc.stdout.close()
+                tar_proc.wait()
+            else:
+                pigz_proc = subprocess.Popen(
+                    ["pigz", f"-{level}"],
+                    stdin=tar_proc.stdout,
+                    stdout=archive,
+                )
+                # Let pigz own the pipe so tar gets SIGPIPE if pigz exits early
+                tar_proc.stdout.close()
+                tar_proc.wait()
+                pigz_proc.wait()
+                if pigz_proc.returncode != 0:
+                    raise Exception(
+                        f"pigz failed with exit code {pigz_proc.returncode}"
+                    )
+
+        if tar_proc.returncode != 0:
+            raise Exception(f"tar failed with exit code {tar_proc.returncode}")
+
+    def _archive_with_tarfile(
+        self,
+        package_files: List[str],
+        archive: IO[bytes],
+        level: int,
+        use_isal: bool = False,
+    ):
+        """Write archive in-process with tarfile"""
+        if use_isal:
+            with self._isal_writer(archive, level) as gz:
+                with tarfile.open(fileobj=gz, mode="w|") as tar:
+                    self._add_files_to_tar(tar, package_files)
+        else:
+            with tarfile.open(fileobj=archive, mode="w:gz", compresslevel=level) as tar:
+                self._add_files_to_tar(tar, package_files)
+
+    def _add_files_to_tar(self, tar: tarfile.TarFile, package_files: List[str]):
+        """Add the collected package files to an open tarfile"""
+        for arcname in package_files:
+            tar.add(
+                os.path.join(self.package_path, arcname),
+                arcname=arcname,
+                recursive=False,
+            )
+
+    @staticmethod
+    def _isal_writer(archive: IO[bytes], level: int) -> "igzip.IGzipFile":
+        """Open a gzip stream over archive using ISA-L's SIMD DEFLATE"""
+        # ISA-L only has levels 0-3; even its highest is faster than zlib's 1
+        return igzip.IGzipFile(
+            fileobj=archive,
+            mode="wb",
+            compresslevel=min(level, isal_zlib.ISAL_BEST_COMPRESSION),
+        )
+
+    def validate_package_structure(self, package_files: List[str]):
         """Validate that package contains required edge.json"""
-        with tarfile.open(package_file, "r:gz") as tar:
-            # Check if edge.json exists at root level
-            edge_json_found = False
-            for member in tar.getmembers():
-                if member.name == "edge.json" or member.name == "./edge.json":
-                    edge_json_found = True
-                    # Extract and validate edge.json content
-                    edge_json_file = tar.extractfile(member)
-                    if edge_json_file:
-                        try:
-                            edge_config = json.loads(
-                                edge_json_file.read().decode("utf-8")
-                            )
-                            if "script_path" not in edge_config:
-                                raise Exception(
-                                    "edge.json must contain 'script_path' key"
-                                )
-
-                            script_path = edge_config["script_path"]
-                            if not script_path:
-                                raise Exception("script_path cannot be empty")
-
-                            # Validate script file exists in archive
-                            script_found = False
-                            for script_member in tar.getmembers():
-                                if (
-                                    script_member.name == script_path
-                                    or script_member.name == f"./{script_path}"
-                                ):
-                                    script_found = True
-                                    break
-
-                            if not script_found:
-                                raise Exception(
-                                    f"Script file '{script_path}' not found in package"
-                                )
-
-                        except json.JSONDecodeError as e:
-                            raise Exception(f"Invalid JSON in edge.json: {str(e)}")
-                    break
-
-            if not edge_json_found:
-                raise Exception("edge.json file not found at root level of package")
+        # Validate against the collected file list and the source tree, so the
+        # archive never has to be decompressed again
+        member_names = set(package_files)
+
+        # Check if edge.json exists at root level
+        if "edge.json" not in member_names:
+            raise Exception("edge.json file not found at root level of package")
+
+        with open(os.path.join(self.package_path, "edge.json"), "rb") as f:
+            try:
+                edge_config = json.loads(f.read().decode("utf-8"))
+            except json.JSONDecodeError as e:
+                raise Exception(f"Invalid JSON in edge.json: {str(e)}")
+
+        if "script_path" not in edge_config:
+            raise Exception("edge.json must contain 'script_path' key")
+
+        script_path = edge_config["script_path"]
+        if not script_path:
+            raise Exception("script_path cannot be empty")
+
+        # Validate script file exists in package
+        if script_path not in member_names:
+            raise Exception(f"Script file '{script_path}' not found in package")
 
     def upload_package_to_api(self, package_file: str) -> Dict[str, Any]:
         """Upload package to the API with upsert functionality"""
         url = f"{self.base_url}/public/sun/open-api/v1/packages/"
 
-        headers = {
-            "Authorization": f"Bearer {self.api_token}",
-            "Accept": "application/json",
-        }
-
-        files = {"package_file": open(package_file, "rb")}
+        headers = {"Accept": "application/json"}
+
+        # Map the archive read-only so the encoder copies chunks straight from
+        # the page cache instead of issuing a read() syscall per chunk
+        with open(package_file, "rb") as package_fh, mmap.mmap(
+            package_fh.fileno(), 0, access=mmap.ACCESS_READ
+        ) as package_map:
+
+            def build_body() -> Dict[str, Any]:
+                # The encoder streams the file in chunks and can only be sent
+                # once, so rewind and rebuild it for every attempt
+                package_map.seek(0)
+                encoder = MultipartEncoder(
+                    fields={
+                        "name": self.package_name,
+                        "tag": self.package_tag,
+                        "upsert": "true",
+                        "package_file": (
+                            os.path.basename(package_file),
+                            # FileWrapper reports the bytes left to read, which
+                            # the encoder needs to know when the part is done
+                            FileWrapper(package_map),
+                            "application/gzip",
+                        ),
+                    }
+                )
+                return {
+                    "data": encoder,
+                    "headers": {**headers, "Content-Type": encoder.content_type},
+                }
 
-        data = {"name": self.package_name, "tag": self.package_tag, "upsert": "true"}
-
-        response = self.make_request_with_retry(
-            "POST", url, headers=headers, files=files, data=data
-        )
+            response = self.make_request_with_retry("POST", url, prepare=build_body)
 
         if response.status_code in [200, 201]:
             result = response.json()
@@ -282,9 +627,28 @@ class EdgePlatformAction:
             deployment_results = []
             deployment_ids = []
 
-            for node_id in node_id_list:
-                self.log(f"Deploying to node: {node_id}")
-                deployment_result = self.deploy_to_node(package_id, node_id)
+            # Deployments are independent and I/O bound, so run them concurrently:
+            # multiplexed over HTTP/2 when httpx is available, else in threads
+            if httpx is not None:
+                node_results = asyncio.run(
+                    self._deploy_to_nodes_async(package_id, node_id_list)
+                )
+                # Every deployment has finished by now, so fail once for all
+                # nodes that did not succeed
+                failures = [r for r in node_results if isinstance(r, BaseException)]
+                if failures:
+                    self.error("; ".join(str(failure) for failure in failures))
+            else:
+
+                def deploy(node_id: str) -> Dict[str, Any]:
+                    self.log(f"Deploying to node: {node_id}")
+                    return self.deploy_to_node(package_id, node_id)
+
+                max_workers = max(1, min(MAX_CONCURRENT_REQUESTS, len(node_id_list)))
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    node_results = list(executor.map(deploy, node_id_list))
+
+            for node_id, deployment_result in zip(node_id_list, node_results):
                 deployment_results.append(
                     {
                         "node_id": node_id,
@@ -317,10 +681,7 @@ class EdgePlatformAction:
         """Fetch all node IDs from API with pagination support"""
         all_node_ids = []
         url = f"{self.base_url}/public/sun/open-api/v1/nodes/"
-        headers = {
-            "Authorization": f"Bearer {self.api_token}",
-            "Accept": "application/json",
-        }
+        headers = {"Accept": "application/json"}
         
         while url:
             response = self.make_request_with_retry("GET", url, headers=headers)
@@ -352,10 +713,7 @@ class EdgePlatformAction:
         """Retrieve package ID by name and tag"""
         url = f"{self.base_url}/public/sun/open-api/v1/packages/"
 
-        headers = {
-            "Authorization": f"Bearer {self.api_token}",
-            "Accept": "application/json",
-        }
+        headers = {"Accept": "application/json"}
 
         params = {"name": self.package_name, "tag": self.package_tag}
 
@@ -381,7 +739,6 @@ class EdgePlatformAction:
         url = f"{self.base_url}/public/sun/open-api/v1/deployments/"
 
         headers = {
-            "Authorization": f"Bearer {self.api_token}",
             "Content-Type": "application/json",
             "Accept": "application/json",
         }
@@ -390,6 +747,58 @@ class EdgePlatformAction:
 
         response = self.make_request_with_retry("POST", url, headers=headers, json=data)
 
+        try:
+            return self._handle_deployment_response(node_id, response)
+        except Exception as e:
+            self.error(str(e))
+            return {}
+
+    async def _deploy_to_node_async(
+        self,
+        client: "httpx.AsyncClient",
+        semaphore: asyncio.Semaphore,
+        package_id: int,
+        node_id: str,
+    ) -> Dict[str, Any]:
+        """Deploy package to a specific node over the shared async client"""
+        url = f"{self.base_url}/public/sun/open-api/v1/deployments/"
+        data = {"package_id": package_id, "node_id": node_id}
+
+        async with semaphore:
+            self.log(f"Deploying to node: {node_id}")
+            response = await self.make_async_request_with_retry(
+                client, "POST", url, json=data
+            )
+
+        return self._handle_deployment_response(node_id, response)
+
+    async def _deploy_to_nodes_async(
+        self, package_id: int, node_id_list: List[str]
+    ) -> List[Any]:
+        """Deploy to all nodes concurrently over one multiplexed HTTP/2 connection"""
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        async with httpx.AsyncClient(
+            http2=True,
+            headers={
+                "Authorization": f"Bearer {self.api_token}",
+                "Accept": "application/json",
+            },
+            timeout=30,
+        ) as client:
+            # Collect failures as results, so one failed node never cancels
+            # deployments still in flight to the others
+            return await asyncio.gather(
+                *(
+                    self._deploy_to_node_async(client, semaphore, package_id, node_id)
+                    for node_id in node_id_list
+                ),
+                return_exceptions=True,
+            )
+
+    def _handle_deployment_response(
+        self, node_id: str, response: Any
+    ) -> Dict[str, Any]:
+        """Return the created deployment, or raise if it was not created"""
         if response.status_code == 201:
             result = response.json()
             self.log(
@@ -397,48 +806,93 @@ class EdgePlatformAction:
             )
             return result
         else:
-            self.error(
+            raise Exception(
                 f"Deployment to node {node_id} failed with status {response.status_code}: {response.text}"
             )
-            return {}
 
     def make_request_with_retry(
-        self, method: str, url: str, max_retries: int = 3, **kwargs
+        self,
+        method: str,
+        url: str,
+        max_retries: int = 3,
+        prepare: Optional[Callable[[], Dict[str, Any]]] = None,
+        **kwargs,
     ) -> requests.Response:
         """Make HTTP request with exponential backoff retry logic"""
         for attempt in range(max_retries):
             try:
-                response = requests.request(method, url, timeout=30, **kwargs)
-
-                # Don't retry on authentication errors
-                if response.status_code == 401:
-                    raise Exception(f"Authentication failed: {response.text}")
+                # prepare() supplies per-attempt arguments such as streaming bodies
+                request_kwargs = {**kwargs, **prepare()} if prepare else kwargs
+                response = self.session.request(
+                    method, url, timeout=30, **request_kwargs
+                )
 
-                # Don't retry on client errors (4xx except 429)
-                if 400 <= response.status_code < 500 and response.status_code != 429:
+                if not self._is_retryable(response) or attempt == max_retries - 1:
                     return response
 
-                # Return successful responses
-                if response.status_code < 400:
+                wait_time = self._retry_delay(attempt, response)
+                if wait_time is None:
+                    self.log(
+                        f"Request failed (status {response.status_code}), server asked "
+                        f"to retry after more than {MAX_RETRY_AFTER}s, not retrying"
+                    )
                     return response
 
-                # Retry on server errors and 429
+                self.log(
+                    f"Request failed (status {response.status_code}), retrying in {wait_time:.1f}s..."
+                )
+                time.sleep(wait_time)
+
+            except requests.exceptions.RequestException as e:
                 if attempt < max_retries - 1:
-                    wait_time = 2**attempt
+                    wait_time = self._retry_delay(attempt)
                     self.log(
-                        f"Request failed (status {response.status_code}), retrying in {wait_time}s..."
+                        f"Request exception: {str(e)}, retrying in {wait_time:.1f}s..."
                     )
                     time.sleep(wait_time)
                 else:
+                    raise Exception(
+                        f"Request failed after {max_retries} attempts: {str(e)}"
+                    )
+
+        raise Exception(f"Request failed after {max_retries} attempts")
+
+    async def make_async_request_with_retry(
+        self,
+        client: "httpx.AsyncClient",
+        method: str,
+        url: str,
+        max_retries: int = 3,
+        **kwargs,
+    ) -> "httpx.Response":
+        """Async counterpart of make_request_with_retry for the httpx client"""
+        for attempt in range(max_retries):
+            try:
+                response = await client.request(method, url, **kwargs)
+
+                if not self._is_retryable(response) or attempt == max_retries - 1:
                     return response
 
-            except requests.exceptions.RequestException as e:
+                wait_time = self._retry_delay(attempt, response)
+                if wait_time is None:
+                    self.log(
+                        f"Request failed (status {response.status_code}), server asked "
+                        f"to retry after more than {MAX_RETRY_AFTER}s, not retrying"
+                    )
+                    return response
+
+                self.log(
+                    f"Request failed (status {response.status_code}), retrying in {wait_time:.1f}s..."
+                )
+                await asyncio.sleep(wait_time)
+
+            except httpx.TransportError as e:
                 if attempt < max_retries - 1:
-                    wait_time = 2**attempt
+                    wait_time = self._retry_delay(attempt)
                     self.log(
-                        f"Request exception: {str(e)}, retrying in {wait_time}s..."
+                        f"Request exception: {str(e)}, retrying in {wait_time:.1f}s..."
                     )
-                    time.sleep(wait_time)
+                    await asyncio.sleep(wait_time)
                 else:
                     raise Exception(
                         f"Request failed after {max_retries} attempts: {str(e)}"
@@ -446,19 +900,88 @@ class EdgePlatformAction:
 
         raise Exception(f"Request failed after {max_retries} attempts")
 
+    def _is_retryable(self, response: Any) -> bool:
+        """Whether a response should be retried (server errors and 429)"""
+        # Don't retry on authentication errors
+        if response.status_code == 401:
+            raise Exception(f"Authentication failed: {response.text}")
+
+        # Don't retry on client errors (4xx except 429) or successful responses
+        return response.status_code >= 500 or response.status_code == 429
+
+    def _retry_delay(
+        self, attempt: int, response: Optional[Any] = None
+    ) -> Optional[float]:
+        """Seconds to wait before a retry, or None if Retry-After is too long"""
+        retry_after = (
+            response.headers.get("Retry-After") if response is not None else None
+        )
+        if retry_after:
+            delay = None
+            try:
+                delay = max(0.0, float(retry_after))
+            except ValueError:
+                try:
+                    retry_at = parsedate_to_datetime(retry_after)
+                    # "-0000" dates parse as naive datetimes but are UTC
+                    if retry_at.tzinfo is None:
+                        retry_at = retry_at.replace(tzinfo=timezone.utc)
+                    delay = max(0.0, retry_at.timestamp() - time.time())
+                except (TypeError, ValueError):
+                    pass
+
+            if delay is not None:
+                # Never retry sooner than asked, but don't let a server stall
+                # the job either: give up when it asks for longer than the cap
+                return delay if delay <= MAX_RETRY_AFTER else None
+
+        # Full jitter keeps concurrent requests from retrying in lockstep
+        return random.uniform(0, 2**attempt)
+
     def set_output(self, name: str, value: Any):
         """Set GitHub Actions output"""
         if isinstance(value, (dict, list)):
             value = json.dumps(value)
 
-        # GitHub Actions output format
+        # GitHub Actions output format, buffered until _flush_outputs()
         if "GITHUB_OUTPUT" in os.environ:
-            with open(os.environ["GITHUB_OUTPUT"], "a") as f:
-                f.write(f"{name}={value}\n")
+            self._outputs.append(f"{name}={value}\n")
         else:
             # Fallback for local testing
             print(f"::set-output name={name}::{value}")
 
+    def _flush_outputs(self):
+        """Write buffered outputs to GITHUB_OUTPUT in a single append"""
+        if not self._outputs:
+            return
+        with open(os.environ["GITHUB_OUTPUT"], "a") as f:
+            f.writelines(self._outputs)
+        self._outputs.clear()
+
+    def _emit_push_outputs(self, result: Dict[str, Any]):
+        """Set outputs for the push step"""
+        self.set_output("push_status", result.get("status", "skipped"))
+
+    def _emit_upload_outputs(self, result: Dict[str, Any]):
+        """Set outputs for a successful upload step"""
+        if result.get("status") != "success":
+            return
+        self.set_output("upload_package_id", result.get("package_id"))
+        self.set_output("upload_package_url", result.get("package_url"))
+        self.set_output("upload_status", "success")
+        self.set_output("upload_was_updated", result.get("was_updated", False))
+
+    def _emit_deploy_outputs(self, result: Dict[str, Any]):
+        """Set outputs for a successful or partial deploy step"""
+        status = result.get("status")
+        if status not in ["success", "partial"]:
+            return
+        self.set_output("deploy_deployment_ids", result.get("deployment_ids", []))
+        self.set_output(
+            "deploy_deployment_summary", result.get("deployment_summary", [])
+        )
+        self.set_output("deploy_status", status)
+
     def log(self, message: str):
         """Log message to stdout"""
         print(f"[INFO] {message}")
@@ -478,34 +1001,23 @@ class EdgePlatformAction:
             results = self.execute_workflows()
 
             # Set outputs based on results
+            emitters: Dict[str, Callable[[Dict[str, Any]], None]] = {
+                "push": self._emit_push_outputs,
+                "upload": self._emit_upload_outputs,
+                "deploy": self._emit_deploy_outputs,
+            }
             for workflow_step, result in results.items():
-                if workflow_step == "upload" and result.get("status") == "success":
-                    self.set_output("upload_package_id", result.get("package_id"))
-                    self.set_output("upload_package_url", result.get("package_url"))
-                    self.set_output("upload_status", "success")
-                    self.set_output(
-                        "upload_was_updated", result.get("was_updated", False)
-                    )
-                elif workflow_step == "deploy" and result.get("status") in [
-                    "success",
-                    "partial",
-                ]:
-                    self.set_output(
-                        "deploy_deployment_ids", result.get("deployment_ids", [])
-                    )
-                    self.set_output(
-                        "deploy_deployment_summary",
-                        result.get("deployment_summary", []),
-                    )
-                    self.set_output("deploy_status", result.get("status"))
-                elif workflow_step == "push":
-                    self.set_output("push_status", result.get("status", "skipped"))
+                emitters[workflow_step](result)
 
             self.log("Edge Action completed successfully")
 
         except Exception as e:
             self.error(f"Action failed: {str(e)}")
 
+        finally:
+            # Also runs when a step fails via error() / sys.exit
+            self._flush_outputs()
+
 
 if __name__ == "__main__":
     action = EdgePlatformAction()
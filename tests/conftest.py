@@ -0,0 +1,45 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import EdgePlatformAction  # noqa: E402
+
+
+@pytest.fixture
+def package_dir(tmp_path):
+    """Build a package tree from relative file paths"""
+
+    def build(*paths):
+        for path in paths:
+            file_path = tmp_path / path
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            file_path.write_text(path)
+        return tmp_path
+
+    return build
+
+
+@pytest.fixture
+def make_action(monkeypatch):
+    """Create an upload action for package_path with extra INPUT_* values"""
+
+    def make(package_path, **inputs):
+        for name in list(os.environ):
+            if name.startswith("INPUT_"):
+                monkeypatch.delenv(name)
+        env = {
+            "INPUT_API_TOKEN": "token",
+            "INPUT_WORKFLOW": "upload",
+            "INPUT_PACKAGE_PATH": str(package_path),
+            "INPUT_PACKAGE_NAME": "pkg",
+            "INPUT_PACKAGE_TAG": "v1",
+        }
+        env.update({f"INPUT_{k.upper()}": v for k, v in inputs.items()})
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        return EdgePlatformAction()
+
+    return make
@@ -0,0 +1,50 @@
+import os
+
+
+def test_include_star_does_not_cross_directories(package_dir, make_action):
+    root = package_dir("src/main.js", "src/lib/u.js", "app/src/x.js")
+    action = make_action(root, include_patterns="src/*.js")
+
+    assert sorted(action.collect_package_files()[0]) == ["app/src/x.js", "src/main.js"]
+
+
+def test_include_double_star_matches_top_level(package_dir, make_action):
+    root = package_dir("x", "a/x", "a/b/x", "ax")
+    action = make_action(root, include_patterns="**/x")
+
+    assert sorted(action.collect_package_files()[0]) == ["a/b/x", "a/x", "x"]
+
+
+def test_exclude_path_pattern_does_not_cross_directories(package_dir, make_action):
+    root = package_dir("dist/a.map", "dist/deep/z.map", "dist/app.js")
+    action = make_action(root, exclude_patterns="dist/*.map")
+
+    assert sorted(action.collect_package_files()[0]) == ["dist/app.js", "dist/deep/z.map"]
+
+
+def test_exclude_trailing_slash_excludes_directory(package_dir, make_action):
+    root = package_dir("dist/a.js", "dist/deep/b.js", "edge.json")
+    action = make_action(root, exclude_patterns="dist/")
+
+    assert action.collect_package_files()[0] == ["edge.json"]
+
+
+def test_mostly_precompressed_package_uses_level_1(package_dir, make_action):
+    root = package_dir("edge.json", "assets/photo.jpg")
+    (root / "assets/photo.jpg").write_bytes(b"\xff" * 4096)
+    action = make_action(root)
+
+    files, total_bytes, precompressed_bytes = action.collect_package_files()
+
+    assert precompressed_bytes == 4096
+    assert action._select_compress_level(total_bytes, precompressed_bytes) == 1
+
+
+def test_create_archive_without_byte_counts(package_dir, make_action):
+    root = package_dir("edge.json", "run.sh")
+    action = make_action(root)
+
+    archive = action.create_package_archive(["edge.json", "run.sh"])
+
+    assert os.path.getsize(archive) > 0
+    os.unlink(archive)
@@ -0,0 +1,30 @@
+import types
+
+import main
+
+
+def make_response(status_code, retry_after=None):
+    headers = {"Retry-After": retry_after} if retry_after else {}
+    return types.SimpleNamespace(status_code=status_code, headers=headers, text="")
+
+
+def test_retry_after_within_cap_is_honored(tmp_path, make_action):
+    action = make_action(tmp_path)
+
+    assert action._retry_delay(0, make_response(429, "5")) == 5.0
+
+
+def test_retry_after_above_cap_is_not_retried(tmp_path, make_action, monkeypatch):
+    action = make_action(tmp_path)
+    responses = [make_response(429, str(main.MAX_RETRY_AFTER * 2))]
+    monkeypatch.setattr(action.session, "request", lambda *a, **kw: responses.pop())
+    monkeypatch.setattr(main.time, "sleep", lambda s: fail_on_sleep(s))
+
+    response = action.make_request_with_retry("GET", "http://example.invalid/")
+
+    assert response.status_code == 429
+    assert responses == []
+
+
+def fail_on_sleep(seconds):
+    raise AssertionError(f"slept {seconds}s instead of giving up")